@@ -2,18 +2,22 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timedelta
+from datetime import timedelta
 import logging
 import random
+import time
 
 import aiohttp
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval, async_track_time_change
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import dt as dt_util
-from homeassistant.helpers.event import async_track_time_interval, async_track_time_change
 
 from .const import (
     DOMAIN,
@@ -21,23 +25,53 @@ from .const import (
     CONF_OIL_PROVINCE,
     CONF_AIR_CITY,
     CONF_SCROLL_INTERVAL,
-    API_BASE_URL,
-    API_HOT_NEWS,
-    API_OIL_PRICE,
-    API_EXCHANGE_RATE,
-    API_AIR_QUALITY,
+    CONF_DEFERRED_SETUP,
+    CONF_ENDPOINTS,
+    CONF_SCROLL_PUSH_ONLY,
+    CONF_OIL_THRESHOLD,
+    CONF_RATE_THRESHOLD,
+    CONF_AIR_THRESHOLD,
+    DEFAULT_DEFERRED_SETUP,
+    DEFAULT_SCROLL_PUSH_ONLY,
+    DEFAULT_OIL_THRESHOLD,
+    DEFAULT_RATE_THRESHOLD,
+    DEFAULT_AIR_THRESHOLD,
+    API_ENDPOINTS,
+    SIGNAL_SCROLL_FRAME,
 )
+from .api import endpoint_params, endpoint_url
+from .history import TianMetricHistory, async_remove_history
+from .websocket import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Tian Realtime component."""
+    async_register_websocket_commands(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Tian Realtime from a config entry."""
-    
+    setup_start = time.monotonic()
+
     # 创建会话
     session = aiohttp.ClientSession()
+
+    history = TianMetricHistory(
+        hass,
+        entry.entry_id,
+        {
+            CONF_OIL_THRESHOLD: entry.options.get(CONF_OIL_THRESHOLD, DEFAULT_OIL_THRESHOLD),
+            CONF_RATE_THRESHOLD: entry.options.get(CONF_RATE_THRESHOLD, DEFAULT_RATE_THRESHOLD),
+            CONF_AIR_THRESHOLD: entry.options.get(CONF_AIR_THRESHOLD, DEFAULT_AIR_THRESHOLD),
+        },
+    )
     
     coordinator = TianRealtimeCoordinator(
         hass,
@@ -45,10 +79,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry.data[CONF_API_KEY],
         entry.data[CONF_OIL_PROVINCE],
         entry.data[CONF_AIR_CITY],
-        entry.data[CONF_SCROLL_INTERVAL]
+        entry.data[CONF_SCROLL_INTERVAL],
+        history,
+        # 旧配置没有探测结果，默认全部接口可用
+        entry.data.get(CONF_ENDPOINTS, list(API_ENDPOINTS)),
+        entry.entry_id,
+        entry.options.get(CONF_SCROLL_PUSH_ONLY, DEFAULT_SCROLL_PUSH_ONLY),
     )
-    
-    await coordinator.async_config_entry_first_refresh()
+
+    deferred = entry.options.get(CONF_DEFERRED_SETUP, DEFAULT_DEFERRED_SETUP)
+    if not deferred:
+        await coordinator.async_config_entry_first_refresh()
     
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
@@ -58,6 +99,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # 选项（变化阈值）修改后重新加载
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    if deferred:
+        # 延迟模式：实体先以不可用状态加入，首次获取在后台进行
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh(),
+            f"{DOMAIN}_first_refresh_{entry.entry_id}",
+        )
+
+    _LOGGER.debug(
+        "Tian Realtime setup finished in %.3f seconds (deferred=%s)",
+        time.monotonic() - setup_start,
+        deferred,
+    )
+
     return True
 
 
@@ -68,16 +126,28 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         coordinator = data["coordinator"]
         # 取消滚动更新和定时更新
         coordinator.cancel_all_updates()
+        # 立即保存数值历史，避免重新加载时读到旧数据
+        await coordinator.history.async_flush()
         if "session" in data:
             await data["session"].close()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored history when a config entry is deleted."""
+    await async_remove_history(hass, entry.entry_id)
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload config entry when options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 class TianRealtimeCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Tian Realtime data."""
 
-    def __init__(self, hass, session, api_key, oil_province, air_city, scroll_interval):
+    def __init__(self, hass, session, api_key, oil_province, air_city, scroll_interval, history, endpoints, entry_id, scroll_push_only):
         """Initialize."""
         super().__init__(
             hass,
@@ -92,6 +162,10 @@ class TianRealtimeCoordinator(DataUpdateCoordinator):
         self.oil_province = oil_province
         self.air_city = air_city
         self.scroll_interval = scroll_interval
+        self.history = history
+        self.endpoints = set(endpoints)
+        self.scroll_signal = SIGNAL_SCROLL_FRAME.format(entry_id)
+        self.scroll_push_only = scroll_push_only
         self._data_cache = {}
         self._hot_data = {}
         self._current_hot_index = 0
@@ -272,22 +346,25 @@ class TianRealtimeCoordinator(DataUpdateCoordinator):
         if self._hot_data and len(self._hot_data) > 0:
             # 更新当前头条索引
             self._current_hot_index = (self._current_hot_index + 1) % len(self._hot_data)
-            
-            # 通知传感器更新
-            self.async_set_updated_data(self._data_cache)
+
+            # 推送新的滚动帧给订阅的前端卡片和滚动内容实体，其他实体不更新
+            async_dispatcher_send(self.hass, self.scroll_signal, self.get_scroll_frame())
 
     async def _async_update_data(self):
         """Update data via API."""
         try:
             # 使用正确的日期时间格式 - 修正为 YYYY-MM-DD HH:MM:SS
             current_time = dt_util.now().strftime("%Y-%m-%d %H:%M:%S")
+
+            # 首次更新时加载历史数值
+            await self.history.async_load()
             
-            # 并行获取所有数据
+            # 并行获取所有数据，跳过密钥未开通的接口
             tasks = [
-                self._fetch_hot_news(),
-                self._fetch_oil_price(),
-                self._fetch_exchange_rate(),
-                self._fetch_air_quality()
+                self._fetch_hot_news() if "hot" in self.endpoints else self._not_subscribed(hot=True),
+                self._fetch_oil_price() if "oil" in self.endpoints else self._not_subscribed(),
+                self._fetch_exchange_rate() if "rate" in self.endpoints else self._not_subscribed(),
+                self._fetch_air_quality() if "air" in self.endpoints else self._not_subscribed()
             ]
             
             today_hot, today_oil, today_rate, today_air = await asyncio.gather(*tasks)
@@ -312,6 +389,9 @@ class TianRealtimeCoordinator(DataUpdateCoordinator):
                 "today_air": today_air,
                 "last_update": current_time
             }
+
+            # 记录数值历史并生成趋势属性
+            self.history.async_update(data)
             
             # 更新缓存
             self._data_cache = data
@@ -333,11 +413,21 @@ class TianRealtimeCoordinator(DataUpdateCoordinator):
             
             return error_data
 
+    def _endpoint_params(self, endpoint):
+        """Return the request parameters of an endpoint."""
+        return endpoint_params(endpoint, self.api_key, self.oil_province, self.air_city)
+
+    async def _not_subscribed(self, hot=False):
+        """Return placeholder data for an endpoint the API key cannot access."""
+        if hot:
+            return {"detail": "未开通该接口", "hot_data": {}, "hot_index": 0}
+        return {"detail": "未开通该接口", "full_data": {}}
+
     async def _fetch_hot_news(self):
         """Fetch hot news from API."""
         try:
-            url = f"{API_BASE_URL}{API_HOT_NEWS}"
-            params = {"key": self.api_key}
+            url = endpoint_url("hot")
+            params = self._endpoint_params("hot")
         
             async with self.session.get(url, params=params) as response:
                 if response.status == 200:
@@ -383,8 +473,8 @@ class TianRealtimeCoordinator(DataUpdateCoordinator):
     async def _fetch_oil_price(self):
         """Fetch oil price from API."""
         try:
-            url = f"{API_BASE_URL}{API_OIL_PRICE}"
-            params = {"key": self.api_key, "prov": self.oil_province}
+            url = endpoint_url("oil")
+            params = self._endpoint_params("oil")
             
             async with self.session.get(url, params=params) as response:
                 if response.status == 200:
@@ -409,14 +499,8 @@ class TianRealtimeCoordinator(DataUpdateCoordinator):
     async def _fetch_exchange_rate(self):
         """Fetch exchange rate from API."""
         try:
-            url = f"{API_BASE_URL}{API_EXCHANGE_RATE}"
-            # 使用正确的参数
-            params = {
-                "key": self.api_key,
-                "fromcoin": "USD",
-                "tocoin": "CNY",
-                "money": "100"
-            }
+            url = endpoint_url("rate")
+            params = self._endpoint_params("rate")
             
             async with self.session.get(url, params=params) as response:
                 if response.status == 200:
@@ -445,8 +529,8 @@ class TianRealtimeCoordinator(DataUpdateCoordinator):
     async def _fetch_air_quality(self):
         """Fetch air quality from API."""
         try:
-            url = f"{API_BASE_URL}{API_AIR_QUALITY}"
-            params = {"key": self.api_key, "area": self.air_city}
+            url = endpoint_url("air")
+            params = self._endpoint_params("air")
             
             async with self.session.get(url, params=params) as response:
                 if response.status == 200:
@@ -468,25 +552,34 @@ class TianRealtimeCoordinator(DataUpdateCoordinator):
                 "error": str(err)
             }
 
-    def get_scroll_data(self):
-        """Get data for scrolling display."""
-        if not self._data_cache:
-            return {}
-        
+    def get_scroll_frame(self):
+        """Get the current scroll frame (headline index and text)."""
         # 获取当前头条内容
         current_hot_detail = ""
         if self._hot_data and len(self._hot_data) > 0:
             current_index = (self._current_hot_index % len(self._hot_data)) + 1
             current_hot_detail = self._hot_data.get(str(current_index), "")
+
+        return {
+            "hot_index": self._current_hot_index + 1,
+            "hot_detail": f"📰头条：{current_hot_detail}" if current_hot_detail else "📰头条：暂无新闻",
+        }
+
+    def get_scroll_data(self):
+        """Get data for scrolling display."""
+        if not self._data_cache:
+            return {}
+
+        frame = self.get_scroll_frame()
         
         return {
             "title": "📚实时动态",
             "title1": "实时动态",
             "title2": "今日动态",
-            "hot_detail": f"📰头条：{current_hot_detail}" if current_hot_detail else "📰头条：暂无新闻",
+            "hot_detail": frame["hot_detail"],
             "oil_detail": self._data_cache.get("today_oil", {}).get("detail", ""),
             "rate_detail": self._data_cache.get("today_rate", {}).get("detail", ""),
             "air_detail": self._data_cache.get("today_air", {}).get("detail", ""),
-            "hot_index": self._current_hot_index + 1,
+            "hot_index": frame["hot_index"],
             "update_time": self._last_successful_update
         }
\ No newline at end of file
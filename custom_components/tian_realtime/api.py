@@ -0,0 +1,23 @@
+"""Request helpers for the tianapi endpoints."""
+from __future__ import annotations
+
+from .const import API_BASE_URL, API_ENDPOINTS
+
+
+def endpoint_url(endpoint: str) -> str:
+    """Return the full URL of an endpoint."""
+    return f"{API_BASE_URL}{API_ENDPOINTS[endpoint]}"
+
+
+def endpoint_params(
+    endpoint: str, api_key: str, oil_province: str, air_city: str
+) -> dict[str, str]:
+    """Return the request parameters of an endpoint."""
+    params = {"key": api_key}
+    if endpoint == "oil":
+        params["prov"] = oil_province
+    elif endpoint == "rate":
+        params.update({"fromcoin": "USD", "tocoin": "CNY", "money": "100"})
+    elif endpoint == "air":
+        params["area"] = air_city
+    return params
@@ -1,14 +1,18 @@
 """Config flow for Tian Realtime integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
+import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
     DOMAIN,
@@ -16,10 +20,26 @@ from .const import (
     CONF_OIL_PROVINCE,
     CONF_AIR_CITY,
     CONF_SCROLL_INTERVAL,
+    CONF_DEFERRED_SETUP,
+    CONF_ENDPOINTS,
+    CONF_SCROLL_PUSH_ONLY,
+    CONF_OIL_THRESHOLD,
+    CONF_RATE_THRESHOLD,
+    CONF_AIR_THRESHOLD,
     DEFAULT_SCROLL_INTERVAL,
+    DEFAULT_DEFERRED_SETUP,
+    DEFAULT_SCROLL_PUSH_ONLY,
+    DEFAULT_OIL_THRESHOLD,
+    DEFAULT_RATE_THRESHOLD,
+    DEFAULT_AIR_THRESHOLD,
     MIN_SCROLL_INTERVAL,
     MAX_SCROLL_INTERVAL,
+    API_ENDPOINTS,
+    API_CODES_INVALID_KEY,
+    API_CODES_NOT_SUBSCRIBED,
+    PROBE_TIMEOUT,
 )
+from .api import endpoint_params, endpoint_url
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,16 +51,91 @@ PROVINCES = [
     "云南", "西藏", "陕西", "甘肃", "青海", "宁夏", "新疆"
 ]
 
+async def _async_probe_endpoint(
+    session: aiohttp.ClientSession, endpoint: str, data: dict[str, Any]
+) -> int | None:
+    """Call an endpoint once and return the tianapi result code."""
+    try:
+        async with session.get(
+            endpoint_url(endpoint),
+            params=endpoint_params(
+                endpoint, data[CONF_API_KEY], data[CONF_OIL_PROVINCE], data[CONF_AIR_CITY]
+            ),
+            timeout=aiohttp.ClientTimeout(total=PROBE_TIMEOUT),
+        ) as response:
+            if response.status != 200:
+                raise CannotConnect
+            result = await response.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+        raise CannotConnect from err
+    return result.get("code") if isinstance(result, dict) else None
+
+
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
-    # 这里可以添加API验证逻辑
-    return {"title": "天聚数行-实时动态"}
+    # 每次提交都重新探测，探测结果保存在配置条目中供协调器使用
+    session = async_get_clientsession(hass)
+    codes = dict(zip(
+        API_ENDPOINTS,
+        await asyncio.gather(
+            *(_async_probe_endpoint(session, endpoint, data) for endpoint in API_ENDPOINTS)
+        ),
+    ))
+    _LOGGER.debug("API key probe result codes: %s", codes)
+
+    if all(code in API_CODES_INVALID_KEY for code in codes.values()):
+        raise InvalidAuth
+
+    endpoints = [
+        endpoint
+        for endpoint, code in codes.items()
+        if code not in API_CODES_INVALID_KEY and code not in API_CODES_NOT_SUBSCRIBED
+    ]
+    if not endpoints:
+        raise NoEndpoints
+
+    return {"title": "天聚数行-实时动态", CONF_ENDPOINTS: endpoints}
+
+
+def _user_schema(defaults: dict[str, Any]) -> vol.Schema:
+    """Return the schema of the user and reconfigure steps."""
+    return vol.Schema({
+        vol.Required(CONF_API_KEY, default=defaults.get(CONF_API_KEY, vol.UNDEFINED)): str,
+        vol.Required(
+            CONF_OIL_PROVINCE, default=defaults.get(CONF_OIL_PROVINCE, "福建")
+        ): vol.In(PROVINCES),
+        vol.Required(CONF_AIR_CITY, default=defaults.get(CONF_AIR_CITY, "莆田")): str,
+        vol.Required(
+            CONF_SCROLL_INTERVAL,
+            default=defaults.get(CONF_SCROLL_INTERVAL, DEFAULT_SCROLL_INTERVAL)
+        ): vol.All(
+            vol.Coerce(int),
+            vol.Range(min=MIN_SCROLL_INTERVAL, max=MAX_SCROLL_INTERVAL)
+        ),
+    })
+
+def _description_placeholders() -> dict[str, str]:
+    """Return the placeholders of the user and reconfigure steps."""
+    return {
+        "api_url": "https://www.tianapi.com/",
+        "min_scroll": str(MIN_SCROLL_INTERVAL),
+        "max_scroll": str(MAX_SCROLL_INTERVAL),
+    }
+
 
 class TianRealtimeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Tian Realtime."""
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> TianRealtimeOptionsFlow:
+        """Get the options flow for this handler."""
+        return TianRealtimeOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -48,33 +143,106 @@ class TianRealtimeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            try:
-                info = await validate_input(self.hass, user_input)
-                return self.async_create_entry(title=info["title"], data=user_input)
-            except Exception:  # pylint: disable=broad-except
-                _LOGGER.exception("Unexpected exception")
-                errors["base"] = "unknown"
+            info = await self._async_validate(user_input, errors)
+            if info is not None:
+                return self.async_create_entry(
+                    title=info["title"],
+                    data={**user_input, CONF_ENDPOINTS: info[CONF_ENDPOINTS]},
+                )
 
+        return self.async_show_form(
+            step_id="user",
+            data_schema=_user_schema({}),
+            errors=errors,
+            description_placeholders=_description_placeholders(),
+        )
+
+    async def async_step_reconfigure(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle reconfiguration and probe the API key again."""
+        entry = self._get_reconfigure_entry()
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            info = await self._async_validate(user_input, errors)
+            if info is not None:
+                # 更新配置并刷新可用接口列表，选项和数值历史保持不变
+                return self.async_update_reload_and_abort(
+                    entry,
+                    data={**entry.data, **user_input, CONF_ENDPOINTS: info[CONF_ENDPOINTS]},
+                    reason="reconfigure_successful",
+                )
+
+        return self.async_show_form(
+            step_id="reconfigure",
+            data_schema=_user_schema({**entry.data, **(user_input or {})}),
+            errors=errors,
+            description_placeholders=_description_placeholders(),
+        )
+
+    async def _async_validate(
+        self, user_input: dict[str, Any], errors: dict[str, str]
+    ) -> dict[str, Any] | None:
+        """Validate user input, filling errors on failure."""
+        try:
+            return await validate_input(self.hass, user_input)
+        except CannotConnect:
+            errors["base"] = "cannot_connect"
+        except InvalidAuth:
+            errors["base"] = "invalid_auth"
+        except NoEndpoints:
+            errors["base"] = "no_endpoints"
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected exception")
+            errors["base"] = "unknown"
+        return None
+
+
+class TianRealtimeOptionsFlow(config_entries.OptionsFlow):
+    """Handle options for Tian Realtime."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage startup, change threshold and scroll push options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
         data_schema = vol.Schema({
-            vol.Required(CONF_API_KEY): str,
-            vol.Required(CONF_OIL_PROVINCE, default="福建"): vol.In(PROVINCES),
-            vol.Required(CONF_AIR_CITY, default="莆田"): str,
             vol.Required(
-                CONF_SCROLL_INTERVAL,
-                default=DEFAULT_SCROLL_INTERVAL
-            ): vol.All(
-                vol.Coerce(int),
-                vol.Range(min=MIN_SCROLL_INTERVAL, max=MAX_SCROLL_INTERVAL)
-            ),
+                CONF_DEFERRED_SETUP,
+                default=options.get(CONF_DEFERRED_SETUP, DEFAULT_DEFERRED_SETUP)
+            ): bool,
+            vol.Required(
+                CONF_OIL_THRESHOLD,
+                default=options.get(CONF_OIL_THRESHOLD, DEFAULT_OIL_THRESHOLD)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Required(
+                CONF_RATE_THRESHOLD,
+                default=options.get(CONF_RATE_THRESHOLD, DEFAULT_RATE_THRESHOLD)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Required(
+                CONF_AIR_THRESHOLD,
+                default=options.get(CONF_AIR_THRESHOLD, DEFAULT_AIR_THRESHOLD)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Required(
+                CONF_SCROLL_PUSH_ONLY,
+                default=options.get(CONF_SCROLL_PUSH_ONLY, DEFAULT_SCROLL_PUSH_ONLY)
+            ): bool,
         })
 
-        return self.async_show_form(
-            step_id="user",
-            data_schema=data_schema,
-            errors=errors,
-            description_placeholders={
-                "api_url": "https://www.tianapi.com/",
-                "min_scroll": str(MIN_SCROLL_INTERVAL),
-                "max_scroll": str(MAX_SCROLL_INTERVAL),
-            }
-        )
\ No newline at end of file
+        return self.async_show_form(step_id="init", data_schema=data_schema)
+
+
+class CannotConnect(HomeAssistantError):
+    """Error to indicate we cannot connect."""
+
+
+class InvalidAuth(HomeAssistantError):
+    """Error to indicate there is invalid auth."""
+
+
+class NoEndpoints(HomeAssistantError):
+    """Error to indicate the key has none of the required APIs."""
@@ -7,12 +7,50 @@ CONF_API_KEY = "api_key"
 CONF_OIL_PROVINCE = "oil_province"
 CONF_AIR_CITY = "air_city"
 CONF_SCROLL_INTERVAL = "scroll_interval"
+CONF_DEFERRED_SETUP = "deferred_setup"
+CONF_OIL_THRESHOLD = "oil_change_threshold"
+CONF_RATE_THRESHOLD = "rate_change_threshold"
+CONF_AIR_THRESHOLD = "air_change_threshold"
+CONF_ENDPOINTS = "endpoints"
+CONF_SCROLL_PUSH_ONLY = "scroll_push_only"
 
 # 确保没有 CONF_UPDATE_INTERVAL 相关常量
 DEFAULT_SCROLL_INTERVAL = 15
 MIN_SCROLL_INTERVAL = 5
 MAX_SCROLL_INTERVAL = 300
 
+# 延迟启动：先加载实体，首次数据获取放到后台执行
+DEFAULT_DEFERRED_SETUP = True
+
+# 滚动帧只通过推送发送，不写入实体状态
+DEFAULT_SCROLL_PUSH_ONLY = True
+
+# 数值变化事件阈值（绝对值）
+DEFAULT_OIL_THRESHOLD = 0.05
+DEFAULT_RATE_THRESHOLD = 0.1
+DEFAULT_AIR_THRESHOLD = 10
+
+# 数值历史：指标 -> (数据键, 字段, 阈值配置项)
+HISTORY_METRICS = {
+    "oil_p0": ("today_oil", "p0", CONF_OIL_THRESHOLD),
+    "oil_p92": ("today_oil", "p92", CONF_OIL_THRESHOLD),
+    "oil_p95": ("today_oil", "p95", CONF_OIL_THRESHOLD),
+    "rate_money": ("today_rate", "money", CONF_RATE_THRESHOLD),
+    "air_aqi": ("today_air", "aqi", CONF_AIR_THRESHOLD),
+    "air_pm2_5": ("today_air", "pm2_5", CONF_AIR_THRESHOLD),
+}
+HISTORY_MAX_READINGS = 64
+HISTORY_WINDOW_DAYS = 7
+HISTORY_STORAGE_VERSION = 1
+HISTORY_SAVE_DELAY = 30
+# 重启后短时间内获取到的相同数值不重复记录
+HISTORY_DEDUPE_SECONDS = 3600
+
+EVENT_VALUE_CHANGED = f"{DOMAIN}_value_changed"
+
+# 滚动帧推送信号，按配置条目区分
+SIGNAL_SCROLL_FRAME = f"{DOMAIN}_scroll_frame_{{}}"
+
 # API endpoints
 API_BASE_URL = "https://apis.tianapi.com"
 API_HOT_NEWS = "/toutiaohot/index"
@@ -20,6 +58,20 @@ API_OIL_PRICE = "/oilprice/index"
 API_EXCHANGE_RATE = "/fxrate/index"
 API_AIR_QUALITY = "/aqi/index"
 
+# 接口标识 -> 接口路径
+API_ENDPOINTS = {
+    "hot": API_HOT_NEWS,
+    "oil": API_OIL_PRICE,
+    "rate": API_EXCHANGE_RATE,
+    "air": API_AIR_QUALITY,
+}
+
+# 配置时探测 API 密钥的超时时间（秒）
+PROBE_TIMEOUT = 10
+# 天聚数行返回码：密钥无效 / 未开通该接口
+API_CODES_INVALID_KEY = (190, 230, 240)
+API_CODES_NOT_SUBSCRIBED = (140, 160)
+
 # Entity names
 ENTITY_HOT_NEWS = "头条新闻"
 ENTITY_OIL_PRICE = "今日油价"
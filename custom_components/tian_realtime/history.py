@@ -0,0 +1,175 @@
+"""Numeric value history for Tian Realtime integration."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from datetime import timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    EVENT_VALUE_CHANGED,
+    HISTORY_DEDUPE_SECONDS,
+    HISTORY_MAX_READINGS,
+    HISTORY_METRICS,
+    HISTORY_SAVE_DELAY,
+    HISTORY_STORAGE_VERSION,
+    HISTORY_WINDOW_DAYS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TianMetricHistory:
+    """Keep a ring buffer of recent numeric readings for each metric."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, thresholds: dict[str, float]):
+        """Initialize."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self.thresholds = thresholds
+        self._store = Store(hass, HISTORY_STORAGE_VERSION, _storage_key(entry_id))
+        # 指标 -> deque[(时间戳, 数值)]
+        self._readings: dict[str, deque[tuple[int, float]]] = {}
+        # 指标 -> 上次触发事件时的数值，用于判断累计变化是否超过阈值
+        self._baselines: dict[str, float] = {}
+        self._load_task: asyncio.Task | None = None
+
+    async def async_load(self) -> None:
+        """Load persisted readings once."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load_stored())
+        # 首次刷新任务被取消时不中断加载，卸载时仍可等待加载完成
+        await asyncio.shield(self._load_task)
+
+    async def _async_load_stored(self) -> None:
+        """Read the persisted readings and baselines."""
+        stored = await self._store.async_load()
+        if not isinstance(stored, dict):
+            return
+        for metric, baseline in stored.get("baselines", {}).items():
+            value = _to_float(baseline)
+            if value is not None:
+                self._baselines[metric] = value
+        for metric, readings in stored.get("readings", {}).items():
+            try:
+                self._readings[metric] = deque(
+                    ((int(ts), float(value)) for ts, value in readings),
+                    maxlen=HISTORY_MAX_READINGS,
+                )
+            except (TypeError, ValueError):
+                _LOGGER.warning("Discarding invalid history for %s", metric)
+
+    async def async_flush(self) -> None:
+        """Write pending readings to storage immediately."""
+        # 尚未开始加载时不写入，避免用空数据覆盖已保存的历史
+        if self._load_task is None:
+            return
+        await self._load_task
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the readings in a compact JSON friendly form."""
+        return {
+            "readings": {
+                metric: [[ts, value] for ts, value in readings]
+                for metric, readings in self._readings.items()
+            },
+            "baselines": self._baselines,
+        }
+
+    def async_update(self, data: dict[str, Any]) -> None:
+        """Record readings from fresh coordinator data and add trend attributes."""
+        now = int(dt_util.utcnow().timestamp())
+        changed = False
+
+        for metric, (data_key, field, threshold_key) in HISTORY_METRICS.items():
+            payload = data.get(data_key)
+            if not isinstance(payload, dict) or "error" in payload:
+                continue
+            value = _to_float(payload.get("full_data", {}).get(field))
+            if value is None:
+                continue
+
+            readings = self._readings.setdefault(
+                metric, deque(maxlen=HISTORY_MAX_READINGS)
+            )
+            previous = readings[-1] if readings else None
+            if (
+                previous is None
+                or previous[1] != value
+                or now - previous[0] >= HISTORY_DEDUPE_SECONDS
+            ):
+                readings.append((now, value))
+                changed = True
+
+            stats = self._stats(readings, previous, value, now)
+            payload.setdefault("trend", {})[field] = stats
+
+            # 与上次触发事件时的数值比较，多次小幅变化累计超过阈值时同样触发
+            baseline = self._baselines.setdefault(metric, value)
+            if baseline == value:
+                continue
+            delta = round(value - baseline, 4)
+            if abs(delta) >= self.thresholds.get(threshold_key, 0):
+                self._baselines[metric] = value
+                changed = True
+                self.hass.bus.async_fire(
+                    EVENT_VALUE_CHANGED,
+                    {
+                        "entry_id": self.entry_id,
+                        "metric": metric,
+                        "value": value,
+                        "previous": baseline,
+                        "delta": delta,
+                        "direction": "up" if delta > 0 else "down",
+                    },
+                )
+
+        if changed:
+            self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+    @staticmethod
+    def _stats(readings, previous, value, now) -> dict[str, Any]:
+        """Return delta, direction and window min/max for a metric."""
+        window_start = now - int(timedelta(days=HISTORY_WINDOW_DAYS).total_seconds())
+        window = [v for ts, v in readings if ts >= window_start] or [value]
+
+        if previous is None:
+            delta = None
+            direction = None
+        else:
+            delta = round(value - previous[1], 4)
+            direction = "up" if delta > 0 else "down" if delta < 0 else "flat"
+
+        return {
+            "value": value,
+            "previous": previous[1] if previous else None,
+            "delta": delta,
+            "direction": direction,
+            "min_7d": min(window),
+            "max_7d": max(window),
+        }
+
+
+async def async_remove_history(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the persisted history of a config entry."""
+    await Store(hass, HISTORY_STORAGE_VERSION, _storage_key(entry_id)).async_remove()
+
+
+def _storage_key(entry_id: str) -> str:
+    """Return the storage key for a config entry's history."""
+    return f"{DOMAIN}.{entry_id}.history"
+
+
+def _to_float(value) -> float | None:
+    """Convert an API value to float, returning None if not numeric."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
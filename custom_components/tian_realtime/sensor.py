@@ -1,11 +1,16 @@
 """Sensor platform for Tian Realtime integration."""
 from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import Any
+
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
@@ -38,9 +43,60 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class TianBaseSensor(CoordinatorEntity, SensorEntity):
+# 重启后恢复的属性，只保留摘要信息，不含 hot_data / full_data / trend 等大字段
+RESTORE_ATTRIBUTES = (
+    "detail",
+    "update_time",
+    "title",
+    "title1",
+    "title2",
+    "hot_detail",
+    "hot_index",
+    "oil_detail",
+    "rate_detail",
+    "air_detail",
+)
+
+
+# 滚动内容属性 -> 对应的数据键
+SCROLL_ATTRIBUTE_SOURCES = {
+    "hot_detail": "today_hot",
+    "hot_index": "today_hot",
+    "oil_detail": "today_oil",
+    "rate_detail": "today_rate",
+    "air_detail": "today_air",
+}
+
+
+@dataclass
+class TianSensorExtraStoredData(ExtraStoredData):
+    """Sensor state and compact attributes kept across restarts."""
+
+    native_value: str | None
+    attributes: dict[str, Any]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the stored data."""
+        return {
+            "native_value": self.native_value,
+            "attributes": self.attributes,
+        }
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> TianSensorExtraStoredData | None:
+        """Initialize stored data from a dict."""
+        try:
+            return cls(restored["native_value"], dict(restored["attributes"]))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+class TianBaseSensor(CoordinatorEntity, RestoreEntity, SensorEntity):
     """Base sensor for Tian Realtime."""
 
+    # coordinator.data 中对应的数据键
+    _data_key: str | None = None
+
     def __init__(self, coordinator, entry):
         """Initialize the sensor."""
         super().__init__(coordinator)
@@ -51,24 +107,76 @@ class TianBaseSensor(CoordinatorEntity, SensorEntity):
             manufacturer="天聚数行",
             model="实时数据",
         )
+        self._restored_data: TianSensorExtraStoredData | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last known state when added to hass."""
+        await super().async_added_to_hass()
+        if self._has_fresh_data():
+            return
+        if (extra_data := await self.async_get_last_extra_data()) is not None:
+            self._restored_data = TianSensorExtraStoredData.from_dict(
+                extra_data.as_dict()
+            )
 
+    @property
+    def extra_restore_state_data(self) -> TianSensorExtraStoredData:
+        """Return sensor specific state data to be restored."""
+        attributes = self.extra_state_attributes or {}
+        return TianSensorExtraStoredData(
+            self.native_value,
+            {key: attributes[key] for key in RESTORE_ATTRIBUTES if key in attributes},
+        )
 
-class TianHotNewsSensor(TianBaseSensor):
-    """Representation of Hot News Sensor."""
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Drop the restored state once fresh coordinator data arrives."""
+        if self._has_fresh_data():
+            self._restored_data = None
+        super()._handle_coordinator_update()
+
+    def _has_fresh_data(self) -> bool:
+        """Return True if the coordinator holds a successful payload."""
+        return self._payload_is_fresh(self._data_key)
+
+    def _payload_is_fresh(self, data_key: str) -> bool:
+        """Return True if the payload for data_key came from a successful fetch."""
+        if self.coordinator.data is None:
+            return False
+        # 获取失败时的数据带有 error 字段，此时继续显示恢复的状态
+        payload = self.coordinator.data.get(data_key)
+        if not isinstance(payload, dict) or "error" in payload:
+            return False
+        # 接口返回非 200 时只有空的占位数据，同样不算更新成功
+        return bool(payload.get("full_data") or payload.get("hot_data"))
 
-    _attr_name = ENTITY_HOT_NEWS
-    _attr_unique_id = f"{DOMAIN}_hot_news"
-    _attr_icon = "mdi:newspaper-variant-multiple"
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        # 首次数据尚未获取时，若有恢复的状态则继续显示，否则显示为不可用
+        return super().available and (
+            self.coordinator.data is not None or self._restored_data is not None
+        )
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self.coordinator.data.get("last_update")
+        if self._restored_data is not None:
+            return self._restored_data.native_value
+        return (self.coordinator.data or {}).get("last_update")
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
-        data = self.coordinator.data.get("today_hot", {})
+        if self._restored_data is not None:
+            return dict(self._restored_data.attributes)
+        return self._coordinator_attributes()
+
+    def _coordinator_attributes(self) -> dict[str, Any]:
+        """Return the attributes built from the current coordinator data."""
+        if self.coordinator.data is None:
+            return {}
+        data = self.coordinator.data.get(self._data_key, {})
         # 确保包含 update_time 属性
         attributes = dict(data)
         # 如果数据中没有 update_time，使用 last_update
@@ -77,28 +185,22 @@ class TianHotNewsSensor(TianBaseSensor):
         return attributes
 
 
+class TianHotNewsSensor(TianBaseSensor):
+    """Representation of Hot News Sensor."""
+
+    _attr_name = ENTITY_HOT_NEWS
+    _attr_unique_id = f"{DOMAIN}_hot_news"
+    _attr_icon = "mdi:newspaper-variant-multiple"
+    _data_key = "today_hot"
+
+
 class TianOilPriceSensor(TianBaseSensor):
     """Representation of Oil Price Sensor."""
 
     _attr_name = ENTITY_OIL_PRICE
     _attr_unique_id = f"{DOMAIN}_oil_price"
     _attr_icon = "mdi:gas-station"
-
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        return self.coordinator.data.get("last_update")
-
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        data = self.coordinator.data.get("today_oil", {})
-        # 确保包含 update_time 属性
-        attributes = dict(data)
-        # 如果数据中没有 update_time，使用 last_update
-        if "update_time" not in attributes:
-            attributes["update_time"] = self.coordinator.data.get("last_update")
-        return attributes
+    _data_key = "today_oil"
 
 
 class TianExchangeRateSensor(TianBaseSensor):
@@ -107,22 +209,7 @@ class TianExchangeRateSensor(TianBaseSensor):
     _attr_name = ENTITY_EXCHANGE_RATE
     _attr_unique_id = f"{DOMAIN}_exchange_rate"
     _attr_icon = "mdi:currency-usd"
-
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        return self.coordinator.data.get("last_update")
-
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        data = self.coordinator.data.get("today_rate", {})
-        # 确保包含 update_time 属性
-        attributes = dict(data)
-        # 如果数据中没有 update_time，使用 last_update
-        if "update_time" not in attributes:
-            attributes["update_time"] = self.coordinator.data.get("last_update")
-        return attributes
+    _data_key = "today_rate"
 
 
 class TianAirQualitySensor(TianBaseSensor):
@@ -131,22 +218,7 @@ class TianAirQualitySensor(TianBaseSensor):
     _attr_name = ENTITY_AIR_QUALITY
     _attr_unique_id = f"{DOMAIN}_air_quality"
     _attr_icon = "mdi:air-filter"
-
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        return self.coordinator.data.get("last_update")
-
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        data = self.coordinator.data.get("today_air", {})
-        # 确保包含 update_time 属性
-        attributes = dict(data)
-        # 如果数据中没有 update_time，使用 last_update
-        if "update_time" not in attributes:
-            attributes["update_time"] = self.coordinator.data.get("last_update")
-        return attributes
+    _data_key = "today_air"
 
 
 class TianScrollContentSensor(TianBaseSensor):
@@ -155,13 +227,58 @@ class TianScrollContentSensor(TianBaseSensor):
     _attr_name = ENTITY_SCROLL_CONTENT
     _attr_unique_id = f"{DOMAIN}_scroll_content"
     _attr_icon = "mdi:chart-box-outline"
+    # 滚动变化频繁，不写入记录器
+    _unrecorded_attributes = frozenset({"hot_detail", "hot_index"})
+
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to scroll frames when added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self.coordinator.scroll_signal, self._handle_scroll_frame
+            )
+        )
+
+    @callback
+    def _handle_scroll_frame(self, frame: dict[str, Any]) -> None:
+        """Write the new scroll frame to the state unless in push only mode."""
+        # 仅推送模式下不写入实体状态，记录器不会记录滚动变化
+        if not self.coordinator.scroll_push_only:
+            self.async_write_ha_state()
+
+    def _has_fresh_data(self) -> bool:
+        """Return True if every scrolled payload is fresh."""
+        return all(
+            self._payload_is_fresh(data_key)
+            for data_key in set(SCROLL_ATTRIBUTE_SOURCES.values())
+        )
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self.coordinator.data.get("last_update")
+        if self._restored_data is not None and not any(
+            self._payload_is_fresh(data_key)
+            for data_key in set(SCROLL_ATTRIBUTE_SOURCES.values())
+        ):
+            return self._restored_data.native_value
+        return (self.coordinator.data or {}).get("last_update")
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
-        return self.coordinator.get_scroll_data()
\ No newline at end of file
+        attributes = self._coordinator_attributes()
+        if self._restored_data is None:
+            return attributes
+        restored = self._restored_data.attributes
+        if not attributes:
+            return dict(restored)
+        # 逐项恢复：只有未成功更新的内容继续使用恢复的值
+        for key, data_key in SCROLL_ATTRIBUTE_SOURCES.items():
+            if key in restored and not self._payload_is_fresh(data_key):
+                attributes[key] = restored[key]
+        return attributes
+
+    def _coordinator_attributes(self) -> dict[str, Any]:
+        """Return the attributes built from the current coordinator data."""
+        return self.coordinator.get_scroll_data()
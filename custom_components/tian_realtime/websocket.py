@@ -0,0 +1,68 @@
+"""Websocket API for Tian Realtime integration."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe_scroll)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_scroll",
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def websocket_subscribe_scroll(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to scroll frames without going through the state machine."""
+    entries = hass.data.get(DOMAIN, {})
+    entry_id = msg.get("entry_id") or next(iter(entries), None)
+    if entry_id not in entries:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not found"
+        )
+        return
+
+    coordinator = entries[entry_id]["coordinator"]
+
+    @callback
+    def forward_frame(frame: dict[str, Any]) -> None:
+        """Send a scroll frame to the subscriber."""
+        connection.send_message(websocket_api.event_message(msg["id"], frame))
+
+    @callback
+    def forward_refresh() -> None:
+        """Send the current frame after the coordinator has stored new data."""
+        forward_frame(coordinator.get_scroll_frame())
+
+    unsub_frame = async_dispatcher_connect(
+        hass, coordinator.scroll_signal, forward_frame
+    )
+    unsub_refresh = coordinator.async_add_listener(forward_refresh)
+
+    @callback
+    def unsubscribe() -> None:
+        """Stop forwarding scroll frames."""
+        unsub_frame()
+        unsub_refresh()
+
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_result(msg["id"])
+    # 订阅后立即发送当前帧
+    forward_frame(coordinator.get_scroll_frame())